@@ -1,47 +1,163 @@
-from fastapi import FastAPI, Body
-from fastapi.responses import Response, JSONResponse
-from typing import Any, Dict
-import base64
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter, ValidationError
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import pybase64
 
-from app.models import RenderEnvelope
-from app.pdf.shipment_confirmation import build_shipment_confirmation_pdf
+@lru_cache(maxsize=None)
+def _pdf_builder():
+    """
+    Import the ReportLab-backed builder on first use, so importing app.main
+    (health-only workers, tooling, PDF_WARMUP=0 cold starts) doesn't load
+    ReportLab's font and canvas machinery.
+    """
+    from app.pdf.shipment_confirmation import build_shipment_confirmation_pdf
+    return build_shipment_confirmation_pdf
+
+def _build_pdf(req: Dict[str, Any]) -> bytes:
+    # Runs in the threadpool, so a first-use import never blocks the event loop
+    return _pdf_builder()(req)
+
+def _warmup_reportlab() -> None:
+    """
+    Render a throwaway BOL so ReportLab's lazy font metric loading and
+    stringWidth caches are paid at startup, not by the first real request.
+    """
+    _build_pdf({})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # PDF_WARMUP=0 defers all ReportLab cost to the first render (serverless cold starts)
+    if os.environ.get("PDF_WARMUP", "1") != "0":
+        await run_in_threadpool(_warmup_reportlab)
+    yield
+
+app = FastAPI(
+    title="ULP_PDF_PIPELINE",
+    version="1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+_PDF_FILENAME = "shipment_confirmation.pdf"
+
+# Everything in the /base64 body except the payload itself is constant.
+_BASE64_BODY_PREFIX = (
+    b'{"filename":"' + _PDF_FILENAME.encode() + b'","content_type":"application/pdf","pdf_base64":"'
+)
+_BASE64_BODY_SUFFIX = b'"}'
+
+# Built once so every request reuses the same compiled pydantic-core validator.
+# Only the top level is checked (a JSON object); the envelope is unwrapped
+# below, so odd endpoint/email_to values can never turn it into a "direct" body.
+_BODY_ADAPTER = TypeAdapter(Dict[str, Any])
+
+# Rendered PDFs keyed by a digest of the canonicalized request, so Apps Script
+# retries / duplicate clicks skip ReportLab entirely. Only touched from the
+# event loop, so no lock is needed.
+_PDF_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+_PDF_CACHE_MAX = 256
 
-app = FastAPI(title="ULP_PDF_PIPELINE", version="1.0")
+@app.exception_handler(RequestValidationError)
+async def _validation_error_handler(request: Request, exc: RequestValidationError):
+    # Same body as FastAPI's default 422 handler, serialized with orjson
+    return ORJSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
 
 @app.get("/health")
 def health():
     return {"ok": True}
 
-def _extract_request(payload: Any) -> Dict[str, Any]:
+def _extract_request(raw: bytes) -> Dict[str, Any]:
     """
     Accept either:
       1) Envelope: {"endpoint":..., "email_to":..., "request": {...}}
       2) Direct:   {...shipment request...}
+
+    Parses and validates the raw JSON body in one pass (pydantic-core),
+    skipping the intermediate json.loads dict.
     """
-    if isinstance(payload, dict) and "request" in payload and isinstance(payload["request"], dict):
-        return payload["request"]
-    if isinstance(payload, dict):
-        return payload
-    return {}
+    try:
+        body = _BODY_ADAPTER.validate_json(raw)
+    except ValidationError as e:
+        # Same loc shape as FastAPI's own body errors. The raw input is left
+        # out: for a non-UTF-8 body it is bytes, which the 422 handler can't encode.
+        errors = e.errors(include_url=False, include_input=False)
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in errors]
+        ) from e
+    inner = body.get("request")
+    if isinstance(inner, dict):
+        return inner
+    return body
+
+def _cache_key(req: Dict[str, Any]) -> Optional[bytes]:
+    # The stdlib encoder, not orjson: orjson writes NaN/Infinity as null, which
+    # would give those payloads the same key as a real null.
+    try:
+        canonical = json.dumps(req, sort_keys=True, separators=(",", ":")).encode()
+    except (TypeError, ValueError):
+        return None  # not representable as JSON; just don't cache
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+def _etag(pdf_bytes: bytes) -> str:
+    # PDFs are built with invariant=1, so identical requests give identical bytes
+    return '"' + hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest() + '"'
+
+async def _render_pdf(req: Dict[str, Any]) -> bytes:
+    key = _cache_key(req)
+    if key is not None:
+        cached = _PDF_CACHE.get(key)
+        if cached is not None:
+            _PDF_CACHE.move_to_end(key)
+            return cached
+
+    # ReportLab rendering is CPU-bound; keep it off the event loop
+    pdf_bytes = await run_in_threadpool(_build_pdf, req)
+
+    if key is not None:
+        _PDF_CACHE[key] = pdf_bytes
+        if len(_PDF_CACHE) > _PDF_CACHE_MAX:
+            _PDF_CACHE.popitem(last=False)
+    return pdf_bytes
 
 @app.post("/api/v1/render/shipment-confirmation")
-def render_shipment_confirmation(raw: Dict[str, Any] = Body(...)):
-    req = _extract_request(raw)
-    pdf_bytes = build_shipment_confirmation_pdf(req)
+async def render_shipment_confirmation(request: Request):
+    """
+    Preferred path for callers that can take a binary body: the raw PDF,
+    no base64 inflation (+33%) and no JSON wrapping.
+    """
+    req = _extract_request(await request.body())
+    pdf_bytes = await _render_pdf(req)
 
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": 'inline; filename="shipment_confirmation.pdf"'},
+        headers={
+            "Content-Disposition": f'inline; filename="{_PDF_FILENAME}"',
+            "Content-Length": str(len(pdf_bytes)),
+            "ETag": _etag(pdf_bytes),
+        },
     )
 
 @app.post("/api/v1/render/shipment-confirmation/base64")
-def render_shipment_confirmation_base64(raw: Dict[str, Any] = Body(...)):
-    req = _extract_request(raw)
-    pdf_bytes = build_shipment_confirmation_pdf(req)
-
-    return JSONResponse({
-        "filename": "shipment_confirmation.pdf",
-        "content_type": "application/pdf",
-        "pdf_base64": base64.b64encode(pdf_bytes).decode("utf-8"),
-    })
+async def render_shipment_confirmation_base64(request: Request):
+    req = _extract_request(await request.body())
+    pdf_bytes = await _render_pdf(req)
+
+    # SIMD-accelerated (libbase64); output is JSON-safe ASCII so it is spliced
+    # into the body as-is instead of going through json.dumps
+    body = b"".join((_BASE64_BODY_PREFIX, pybase64.b64encode(pdf_bytes), _BASE64_BODY_SUFFIX))
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Content-Length": str(len(body)), "ETag": _etag(pdf_bytes)},
+    )
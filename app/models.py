@@ -9,6 +9,9 @@ class RenderEnvelope(BaseModel):
       "email_to": "...",
       "request": {...}
     }
+
+    Documentation only: app.main validates the body as a plain dict and
+    unwraps "request" itself, so this model is never instantiated.
     """
     model_config = ConfigDict(extra="allow")  # tolerate extra fields while testing
 
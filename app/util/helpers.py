@@ -1,18 +1,22 @@
+import re
 from typing import Any, Dict
 
+_NON_DIGIT_RE = re.compile(r"\D")
+
 def s(v: Any) -> str:
     return "" if v is None else str(v)
 
 def get_path(d: Dict[str, Any], *path, default=""):
     cur: Any = d
-    for p in path:
-        if not isinstance(cur, dict) or p not in cur:
-            return default
-        cur = cur[p]
+    try:
+        for p in path:
+            cur = cur[p]
+    except (KeyError, IndexError, TypeError):
+        return default
     return cur
 
 def fmt_phone(phone: str) -> str:
-    digits = "".join(ch for ch in (phone or "") if ch.isdigit())
+    digits = _NON_DIGIT_RE.sub("", phone or "")
     if len(digits) == 10:
         return f"{digits[0:3]}-{digits[3:6]}-{digits[6:10]}"
     return phone or ""
@@ -0,0 +1,148 @@
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.main import _extract_request, app
+from app.pdf.shipment_confirmation import _is_job_or_load_, _item_row, _party_block
+
+client = TestClient(app)
+
+RENDER_URL = "/api/v1/render/shipment-confirmation"
+
+@pytest.fixture(autouse=True)
+def _empty_pdf_cache():
+    main._PDF_CACHE.clear()
+    yield
+    main._PDF_CACHE.clear()
+
+
+SHIPMENT = {
+    "ReferenceNumbers": [{"Type": "PO", "ReferenceNumber": "PO-1", "IsPrimary": True}],
+    "Shipper": {"Name": "Acme", "City": "Austin", "StateProvince": "TX"},
+    "Items": [{"Description": "Widgets", "Quantities": {"Actual": 2, "Uom": "PLT"}}],
+}
+
+
+def test_envelope_with_list_email_to_unwraps_request():
+    raw = orjson.dumps({"endpoint": 1, "email_to": ["a@x", "b@y"], "request": SHIPMENT})
+    assert _extract_request(raw) == SHIPMENT
+
+
+def test_direct_body_is_the_request():
+    assert _extract_request(orjson.dumps(SHIPMENT)) == SHIPMENT
+
+
+def test_envelope_with_list_email_to_renders():
+    body = {"email_to": ["a@x", "b@y"], "request": SHIPMENT}
+    resp = client.post("/api/v1/render/shipment-confirmation", json=body)
+    assert resp.status_code == 200
+    assert resp.content.startswith(b"%PDF")
+
+
+def test_non_utf8_body_is_422():
+    resp = client.post("/api/v1/render/shipment-confirmation", content=b"\xff\xfe")
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_non_dict_sub_objects_render():
+    body = {
+        **SHIPMENT,
+        "Dates": "2024-01-02",
+        "Shipper": {"Name": "Acme", "Contact": "555"},
+        "Payment": ["x"],
+        "Meta": "n/a",
+        "Constraints": "none",
+    }
+    resp = client.post("/api/v1/render/shipment-confirmation", json=body)
+    assert resp.status_code == 200
+
+
+def test_non_dict_item_sub_objects_render():
+    items = [{"Description": "Widgets", "Quantities": [1], "Weights": "heavy", "Dimensions": [1, 2, 3]}]
+    resp = client.post("/api/v1/render/shipment-confirmation", json={**SHIPMENT, "Items": items})
+    assert resp.status_code == 200
+
+
+def test_party_lines_with_markup_characters_render():
+    long_name = "AT&T <b>Receiving " + "Dock " * 30
+    body = {**SHIPMENT, "Consignee": {"Name": long_name, "AddressLine1": "1 Main St\nSuite 2"}}
+    resp = client.post("/api/v1/render/shipment-confirmation", json=body)
+    assert resp.status_code == 200
+
+
+def test_repeat_request_is_a_cache_hit(monkeypatch):
+    calls = []
+    real_build = main._build_pdf
+    monkeypatch.setattr(main, "_build_pdf", lambda req: calls.append(req) or real_build(req))
+    first = client.post(RENDER_URL, json=SHIPMENT)
+    second = client.post(RENDER_URL, json=SHIPMENT)
+    assert first.content == second.content
+    assert len(calls) == 1
+
+
+def test_different_payloads_give_different_pdfs():
+    other = {**SHIPMENT, "ReferenceNumbers": [{"Type": "PO", "ReferenceNumber": "PO-2", "IsPrimary": True}]}
+    first = client.post(RENDER_URL, json=SHIPMENT)
+    second = client.post(RENDER_URL, json=other)
+    assert first.content != second.content
+    assert len(main._PDF_CACHE) == 2
+
+
+def test_nan_infinity_and_null_do_not_share_a_cache_entry():
+    pdfs = [
+        client.post(RENDER_URL, content=b'{"Meta":{"TotalWeight":%s}}' % token).content
+        for token in (b"Infinity", b"NaN", b"null")
+    ]
+    assert len(main._PDF_CACHE) == 3
+    # null falls back to summing Items, so it must not be served the "inf lb" BOL
+    assert pdfs[2] != pdfs[0]
+    assert pdfs[2] == main._build_pdf({"Meta": {"TotalWeight": None}})
+
+
+def test_cache_evicts_the_oldest_entry(monkeypatch):
+    monkeypatch.setattr(main, "_build_pdf", lambda req: b"%PDF-" + str(req["n"]).encode())
+    for n in range(main._PDF_CACHE_MAX + 1):
+        client.post(RENDER_URL, json={"n": n})
+    assert len(main._PDF_CACHE) == main._PDF_CACHE_MAX
+    assert main._cache_key({"n": 0}) not in main._PDF_CACHE
+    assert main._cache_key({"n": 1}) in main._PDF_CACHE
+    assert main._cache_key({"n": main._PDF_CACHE_MAX}) in main._PDF_CACHE
+
+
+def test_reference_with_markup_characters_renders():
+    refs = [{"Type": "PO <b>", "ReferenceNumber": "a & <b>", "IsPrimary": True}]
+    resp = client.post(RENDER_URL, json={**SHIPMENT, "ReferenceNumbers": refs})
+    assert resp.status_code == 200
+
+
+def test_item_dims_keep_their_positions():
+    row = _item_row({"Dimensions": {"Length": 48, "Height": 50}})
+    assert row[3] == "48xx50"
+    assert _item_row({"Dimensions": {"Length": 48, "Width": 40, "Height": 50}})[3] == "48x40x50"
+    assert _item_row({})[3] == ""
+
+
+@pytest.mark.parametrize("ref_type", ["Job Name", "Load Number", "Quantity", "Location", "Pickup Location"])
+def test_job_load_reference_types_are_hidden(ref_type):
+    assert _is_job_or_load_(ref_type)
+
+
+@pytest.mark.parametrize("ref_type", ["Relocation", "Locations", "PO", ""])
+def test_other_reference_types_are_shown(ref_type):
+    assert not _is_job_or_load_(ref_type)
+
+
+def test_party_block_without_city_has_no_stray_comma():
+    lines = _party_block({"Name": "Acme", "StateProvince": "TX", "PostalCode": "78701"}, True)
+    assert lines == ["Acme", "TX 78701"]
+
+
+def test_party_block_with_city():
+    lines = _party_block({"City": "Austin", "StateProvince": "TX", "PostalCode": "78701"}, False)
+    assert lines == ["Austin, TX 78701"]
+
+
+def test_empty_party_block_has_no_lines():
+    assert _party_block({}, True) == []